@@ -1,9 +1,16 @@
-from flask import Flask, render_template, request, send_file, redirect, url_for, flash, jsonify
+from flask import Flask, render_template, request, send_file, redirect, url_for, flash, jsonify, Response, stream_with_context
 import os
+import re
 import tempfile
+import threading
 import shutil
 from datetime import datetime
 from autosar_pipeline import load_c_files_from_directory, run_pipeline
+from result_index import (
+    DEFAULT_PAGE_SIZE, FILTER_COLUMNS, ensure_index, index_path_for,
+    query_page, count_rows, read_meta, iter_csv_chunks,
+)
+from watch_mode import ProjectWatcher
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-here'
@@ -14,6 +21,17 @@ OUTPUT_FOLDER = 'outputs'
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 
+# Live (watch mode) projects by name
+LIVE_PROJECTS = {}
+# Names reserved by projects whose initial scan is still running -> directory
+LIVE_PROJECTS_STARTING = {}
+LIVE_PROJECTS_LOCK = threading.Lock()
+
+def _live_projects():
+    """Snapshot of the running live projects, safe to iterate without the lock"""
+    with LIVE_PROJECTS_LOCK:
+        return list(LIVE_PROJECTS.values())
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -50,6 +68,7 @@ def process_directory():
         # Run pipeline
         build_config = {
             "output_csv": output_path,
+            "output_index": index_path_for(output_path),
             "print_issues": False
         }
         
@@ -106,13 +125,18 @@ def api_process():
         output_filename = f"sads_suds_extract_{timestamp}.csv"
         output_path = os.path.join(OUTPUT_FOLDER, output_filename)
         
-        build_config = {"output_csv": output_path, "print_issues": False}
+        build_config = {
+            "output_csv": output_path,
+            "output_index": index_path_for(output_path),
+            "print_issues": False
+        }
         state = run_pipeline(source_files, build_config)
         
         return jsonify({
             'success': True,
             'csv_filename': output_filename,
             'download_url': f'/download/{output_filename}',
+            'results_url': f'/api/results/{output_filename}',
             'total_files': len(source_files),
             'total_functions': len(state.functions),
             'total_variables': len(state.variables),
@@ -124,5 +148,192 @@ def api_process():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def _resolve_result_index(filename):
+    """Return the index path for an output CSV, or None if it does not exist"""
+    if filename != os.path.basename(filename) or not filename.endswith('.csv'):
+        return None
+    # Live projects keep their index current themselves
+    for watcher in _live_projects():
+        if watcher.csv_filename == filename:
+            return watcher.index_path
+    csv_path = os.path.join(OUTPUT_FOLDER, filename)
+    if not os.path.exists(csv_path):
+        return None
+    return ensure_index(csv_path)
+
+def _parse_result_query():
+    """Read filter/sort options shared by the results API and streamed download"""
+    # An empty value is a real filter value: ?swc= selects rows with unresolved SWC
+    filters = {col: request.args.getlist(col) for col in FILTER_COLUMNS}
+    filters['file'] = request.args.get('file', '').strip()
+    filters['name_prefix'] = request.args.get('name_prefix', '').strip()
+    sort = request.args.get('sort', 'id')
+    descending = request.args.get('order', 'asc') == 'desc'
+    return filters, sort, descending
+
+@app.route('/results/<filename>')
+def view_results(filename):
+    index_path = _resolve_result_index(filename)
+    if not index_path:
+        flash('파일을 찾을 수 없습니다.', 'error')
+        return redirect(url_for('index'))
+    meta = read_meta(index_path)
+    return render_template('results.html', csv_filename=filename, meta=meta)
+
+@app.route('/api/results/<filename>')
+def api_results(filename):
+    """Filtered, sorted, cursor-paginated rows of a stored extraction"""
+    index_path = _resolve_result_index(filename)
+    if not index_path:
+        return jsonify({'success': False, 'error': 'Result not found'}), 404
+
+    filters, sort, descending = _parse_result_query()
+    cursor = request.args.get('cursor') or None
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+        page = query_page(index_path, filters, sort=sort, descending=descending,
+                          cursor=cursor, limit=limit)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    response = {
+        'success': True,
+        'rows': page['rows'],
+        'next_cursor': page['next_cursor'],
+        'has_more': page['has_more'],
+    }
+    # Total only on the first page; later pages reuse the client's count
+    if not cursor:
+        response['total'] = count_rows(index_path, filters)
+    return jsonify(response)
+
+@app.route('/api/results/<filename>/meta')
+def api_results_meta(filename):
+    index_path = _resolve_result_index(filename)
+    if not index_path:
+        return jsonify({'success': False, 'error': 'Result not found'}), 404
+    return jsonify({'success': True, **read_meta(index_path)})
+
+@app.route('/api/results/<filename>/download')
+def api_results_download(filename):
+    """Stream the filtered subset as a chunked CSV download"""
+    index_path = _resolve_result_index(filename)
+    if not index_path:
+        return jsonify({'success': False, 'error': 'Result not found'}), 404
+
+    filters, sort, descending = _parse_result_query()
+    try:
+        chunks = iter_csv_chunks(index_path, filters, sort=sort, descending=descending)
+        first = next(chunks)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    def generate():
+        yield first
+        yield from chunks
+
+    download_name = f"{os.path.splitext(filename)[0]}_filtered.csv"
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={download_name}'}
+    )
+
+def _start_live_project(directory_path, name=None):
+    """Start (or reuse) a watch mode project for directory_path.
+
+    An explicit name that is already used by another tree raises ValueError;
+    names derived from the directory are made unique with a numeric suffix.
+    The name is reserved under the lock, but the initial scan runs outside it.
+    """
+    directory_path = os.path.abspath(directory_path)
+    with LIVE_PROJECTS_LOCK:
+        for watcher in LIVE_PROJECTS.values():
+            if watcher.directory_path == directory_path:
+                return watcher
+        if directory_path in LIVE_PROJECTS_STARTING.values():
+            raise ValueError(f'Live project is already starting: {directory_path}')
+
+        taken = set(LIVE_PROJECTS) | set(LIVE_PROJECTS_STARTING)
+        if name:
+            name = re.sub(r'[^A-Za-z0-9_-]', '_', name)
+            if name in taken:
+                raise ValueError(f'Live project name already in use: {name}')
+        else:
+            base = re.sub(r'[^A-Za-z0-9_-]', '_', os.path.basename(directory_path.rstrip(os.sep)) or 'project')
+            name = base
+            suffix = 2
+            while name in taken:
+                name = f'{base}_{suffix}'
+                suffix += 1
+        LIVE_PROJECTS_STARTING[name] = directory_path
+
+    started = False
+    try:
+        watcher = ProjectWatcher(name, directory_path, OUTPUT_FOLDER)
+        watcher.start()
+        started = True
+    finally:
+        with LIVE_PROJECTS_LOCK:
+            del LIVE_PROJECTS_STARTING[name]
+            if started:
+                LIVE_PROJECTS[name] = watcher
+    return watcher
+
+@app.route('/live', methods=['POST'])
+def start_live_project():
+    directory_path = request.form.get('directory_path', '').strip()
+
+    if not directory_path or not os.path.isdir(directory_path):
+        flash(f'유효한 디렉토리가 아닙니다: {directory_path}', 'error')
+        return redirect(url_for('index'))
+
+    try:
+        watcher = _start_live_project(directory_path)
+    except Exception as e:
+        flash(f'감시 모드 시작 중 오류가 발생했습니다: {str(e)}', 'error')
+        return redirect(url_for('index'))
+
+    return redirect(url_for('view_results', filename=watcher.csv_filename))
+
+@app.route('/api/live', methods=['GET'])
+def api_live_list():
+    return jsonify({'success': True, 'projects': [w.status() for w in _live_projects()]})
+
+@app.route('/api/live', methods=['POST'])
+def api_live_start():
+    """Start watching a directory; results refresh on every file save"""
+    data = request.get_json()
+    directory_path = data.get('directory_path', '').strip()
+
+    if not directory_path or not os.path.isdir(directory_path):
+        return jsonify({'success': False, 'error': 'Invalid directory path'}), 400
+
+    try:
+        watcher = _start_live_project(directory_path, data.get('name'))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+    return jsonify({'success': True, **watcher.status()})
+
+@app.route('/api/live/<name>', methods=['GET'])
+def api_live_status(name):
+    with LIVE_PROJECTS_LOCK:
+        watcher = LIVE_PROJECTS.get(name)
+    if not watcher:
+        return jsonify({'success': False, 'error': 'Live project not found'}), 404
+    return jsonify({'success': True, **watcher.status()})
+
+@app.route('/api/live/<name>', methods=['DELETE'])
+def api_live_stop(name):
+    with LIVE_PROJECTS_LOCK:
+        watcher = LIVE_PROJECTS.pop(name, None)
+    if not watcher:
+        return jsonify({'success': False, 'error': 'Live project not found'}), 404
+    watcher.stop()
+    return jsonify({'success': True})
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -7,6 +7,8 @@ from typing import Any, Dict, List, Optional, Tuple
 import pandas as pd
 from pydantic import BaseModel, Field
 
+from result_index import build_index
+
 
 class FunctionInfo(BaseModel):
     name: str
@@ -54,6 +56,7 @@ class PipelineState(BaseModel):
     variables: List[VariableInfo] = Field(default_factory=list)
     rte_interfaces: List[RteInterfaceInfo] = Field(default_factory=list)
     csv_path: str = ""
+    index_path: str = ""
 
 
 RTE_PATTERNS = [
@@ -207,79 +210,59 @@ def extract_rte_calls(preprocessed_files: Dict[str, str], functions: List[Functi
     return rte_list
 
 
-def run_pipeline(source_files: Dict[str, str], build_config: Optional[Dict[str, Any]] = None) -> PipelineState:
-    build_config = build_config or {}
-    state = PipelineState(source_files=source_files, build_config=build_config)
-    
-    # Preprocess
-    pre: Dict[str, str] = {}
-    for path, code in state.source_files.items():
-        norm = code.replace("\r\n", "\n").replace("\r", "\n")
-        pre[path] = strip_comments(norm)
-    state.preprocessed_files = pre
-    
-    # SWC candidates
-    swcs = set()
-    for path in state.preprocessed_files.keys():
-        swc = guess_swc_from_filename(path)
-        if swc:
-            swcs.add(swc)
-    state.swc_candidates = sorted(swcs)
-    if not state.swc_candidates:
-        state.issues.append("SWC 후보를 파일/경로 기반으로 추정하지 못했습니다. (SWC 매핑 정확도 저하 가능)")
-    
-    # Extract symbols
-    ok, funcs, vars_ = try_extract_with_libclang(state.preprocessed_files, state.build_config, state.issues)
+def preprocess_code(code: str) -> str:
+    norm = code.replace("\r\n", "\n").replace("\r", "\n")
+    return strip_comments(norm)
+
+
+def map_swc_for_file(file_path: str) -> Tuple[str, str, str]:
+    swc = guess_swc_from_filename(file_path) or ""
+    if swc:
+        return swc, "high", f"SWC inferred from path/filename: {file_path}"
+    return "", "low", f"SWC unresolved for file: {file_path}"
+
+
+def apply_swc_mapping(items: List[Any]) -> None:
+    for x in items:
+        swc, conf, ev = map_swc_for_file(x.file)
+        x.swc = swc
+        if x.confidence == "low" and conf == "high":
+            x.confidence = "medium"
+        elif x.confidence != "low":
+            x.confidence = conf
+        x.evidence += f" | {ev}"
+
+
+def analyze_files(
+    preprocessed_files: Dict[str, str],
+    build_config: Dict[str, Any],
+    issues: List[str],
+    translation_units: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[FunctionInfo], List[VariableInfo], List[RteInterfaceInfo]]:
+    """Extract symbols and RTE calls from preprocessed files and map them to SWCs.
+
+    Every file is analyzed independently, so callers may pass a subset of a
+    project (watch mode re-analyzes only the files that changed).
+    """
+    ok, funcs, vars_ = try_extract_with_libclang(preprocessed_files, build_config, issues, translation_units)
     if not ok:
-        funcs, vars_ = extract_with_regex_fallback(state.preprocessed_files, state.issues)
-    state.functions = funcs
-    state.variables = vars_
-    
-    # Extract RTE
-    state.rte_interfaces = extract_rte_calls(state.preprocessed_files, state.functions)
-    
-    # Map to SWC
-    def map_item(file_path: str) -> Tuple[str, str, str]:
-        swc = guess_swc_from_filename(file_path) or ""
-        if swc:
-            return swc, "high", f"SWC inferred from path/filename: {file_path}"
-        return "", "low", f"SWC unresolved for file: {file_path}"
-
-    for f in state.functions:
-        swc, conf, ev = map_item(f.file)
-        f.swc = swc
-        if f.confidence == "low" and conf == "high":
-            f.confidence = "medium"
-        elif f.confidence != "low":
-            f.confidence = conf
-        f.evidence += f" | {ev}"
-
-    for v in state.variables:
-        swc, conf, ev = map_item(v.file)
-        v.swc = swc
-        if v.confidence == "low" and conf == "high":
-            v.confidence = "medium"
-        elif v.confidence != "low":
-            v.confidence = conf
-        v.evidence += f" | {ev}"
-
-    for r in state.rte_interfaces:
-        swc, conf, ev = map_item(r.file)
-        r.swc = swc
-        if r.confidence == "low" and conf == "high":
-            r.confidence = "medium"
-        elif r.confidence != "low":
-            r.confidence = conf
-        r.evidence += f" | {ev}"
+        funcs, vars_ = extract_with_regex_fallback(preprocessed_files, issues)
+    rtes = extract_rte_calls(preprocessed_files, funcs)
 
-    unresolved = sum(1 for x in (state.functions + state.variables) if not x.swc)
-    if unresolved:
-        state.issues.append(f"{unresolved}개 심볼이 SWC에 결정적으로 매핑되지 않았습니다(규칙 기반).")
-    
-    # Export CSV
+    apply_swc_mapping(funcs)
+    apply_swc_mapping(vars_)
+    apply_swc_mapping(rtes)
+    return funcs, vars_, rtes
+
+
+def build_result_rows(
+    functions: List[FunctionInfo],
+    variables: List[VariableInfo],
+    rte_interfaces: List[RteInterfaceInfo],
+) -> List[Dict[str, Any]]:
     rows: List[Dict[str, Any]] = []
 
-    for f in state.functions:
+    for f in functions:
         rows.append({
             "swc": f.swc,
             "kind": "function",
@@ -297,7 +280,7 @@ def run_pipeline(source_files: Dict[str, str], build_config: Optional[Dict[str,
             "evidence": f.evidence,
         })
 
-    for v in state.variables:
+    for v in variables:
         rows.append({
             "swc": v.swc,
             "kind": "variable",
@@ -315,7 +298,7 @@ def run_pipeline(source_files: Dict[str, str], build_config: Optional[Dict[str,
             "evidence": v.evidence,
         })
 
-    for r in state.rte_interfaces:
+    for r in rte_interfaces:
         rows.append({
             "swc": r.swc,
             "kind": "rte_interface",
@@ -333,10 +316,48 @@ def run_pipeline(source_files: Dict[str, str], build_config: Optional[Dict[str,
             "evidence": r.evidence,
         })
 
+    return rows
+
+
+def run_pipeline(source_files: Dict[str, str], build_config: Optional[Dict[str, Any]] = None) -> PipelineState:
+    build_config = build_config or {}
+    state = PipelineState(source_files=source_files, build_config=build_config)
+    
+    # Preprocess
+    pre: Dict[str, str] = {}
+    for path, code in state.source_files.items():
+        pre[path] = preprocess_code(code)
+    state.preprocessed_files = pre
+    
+    # SWC candidates
+    swcs = set()
+    for path in state.preprocessed_files.keys():
+        swc = guess_swc_from_filename(path)
+        if swc:
+            swcs.add(swc)
+    state.swc_candidates = sorted(swcs)
+    if not state.swc_candidates:
+        state.issues.append("SWC 후보를 파일/경로 기반으로 추정하지 못했습니다. (SWC 매핑 정확도 저하 가능)")
+    
+    # Extract symbols and RTE, map to SWC
+    state.functions, state.variables, state.rte_interfaces = analyze_files(
+        state.preprocessed_files, state.build_config, state.issues
+    )
+
+    unresolved = sum(1 for x in (state.functions + state.variables) if not x.swc)
+    if unresolved:
+        state.issues.append(f"{unresolved}개 심볼이 SWC에 결정적으로 매핑되지 않았습니다(규칙 기반).")
+    
+    # Export CSV
+    rows = build_result_rows(state.functions, state.variables, state.rte_interfaces)
     df = pd.DataFrame(rows)
     out = state.build_config.get("output_csv", "autosar_swc_extract.csv")
     df.to_csv(out, index=False, encoding="utf-8-sig")
     state.csv_path = out
+
+    index_out = state.build_config.get("output_index")
+    if index_out:
+        state.index_path = build_index(rows, index_out)
     
     # Quality report
     low_or_med = 0
@@ -353,14 +374,22 @@ def run_pipeline(source_files: Dict[str, str], build_config: Optional[Dict[str,
     return state
 
 
-def try_extract_with_libclang(preprocessed_files: Dict[str, str], build_config: Dict[str, Any], issues: List[str]) -> Tuple[bool, List[FunctionInfo], List[VariableInfo]]:
+def try_extract_with_libclang(
+    preprocessed_files: Dict[str, str],
+    build_config: Dict[str, Any],
+    issues: List[str],
+    translation_units: Optional[Dict[str, Any]] = None,
+) -> Tuple[bool, List[FunctionInfo], List[VariableInfo]]:
+    # translation_units: optional path -> TranslationUnit cache kept by the caller;
+    # cached units are reparsed instead of being parsed from scratch.
     try:
         from clang.cindex import Index, TranslationUnit, Config, CursorKind, StorageClass
     except Exception:
         return False, [], []
 
     libclang_path = build_config.get("libclang_path")
-    if libclang_path:
+    # Repeated calls (watch mode) must not try to reload an already loaded library
+    if libclang_path and not Config.loaded:
         try:
             Config.set_library_file(libclang_path)
         except Exception:
@@ -392,12 +421,18 @@ def try_extract_with_libclang(preprocessed_files: Dict[str, str], build_config:
         code = preprocessed_files[path]
         unsaved = [(path, code)]
         try:
-            tu = idx.parse(
-                path,
-                args=clang_args,
-                unsaved_files=unsaved,
-                options=TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD
-            )
+            tu = translation_units.get(path) if translation_units is not None else None
+            if tu is not None:
+                tu.reparse(unsaved_files=unsaved)
+            else:
+                tu = idx.parse(
+                    path,
+                    args=clang_args,
+                    unsaved_files=unsaved,
+                    options=TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD
+                )
+                if translation_units is not None:
+                    translation_units[path] = tu
         except Exception as e:
             issues.append(f"libclang parse 실패({path}): {e}")
             return False, [], []
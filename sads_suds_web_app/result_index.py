@@ -0,0 +1,392 @@
+from __future__ import annotations
+
+import base64
+import csv
+import io
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+CSV_COLUMNS = [
+    "swc", "kind", "name", "signature", "scope", "file", "line",
+    "direction", "port", "data_element", "callee", "caller_function",
+    "confidence", "evidence",
+]
+
+# Columns that accept one or more exact values (?swc=A&swc=B)
+FILTER_COLUMNS = ("swc", "kind", "direction", "confidence")
+# Columns stored as distinct-value lists in the meta table for the filter UI
+FACET_COLUMNS = ("swc", "kind", "direction", "confidence")
+SORT_COLUMNS = ("id", "swc", "kind", "name", "file", "line", "direction", "confidence")
+INDEXED_COLUMNS = ("swc", "kind", "name", "file", "line", "direction", "confidence")
+
+# Bumped whenever the table layout changes; older indexes are rebuilt on access
+INDEX_SCHEMA_VERSION = "2"
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+INSERT_BATCH_SIZE = 5000
+STREAM_CHUNK_ROWS = 2000
+
+# One lock per index path, so building one index never blocks requests for others
+_build_locks: Dict[str, threading.Lock] = {}
+_build_locks_guard = threading.Lock()
+
+
+def index_path_for(csv_path: str) -> str:
+    return os.path.splitext(csv_path)[0] + ".sqlite"
+
+
+def _insert_sql() -> str:
+    placeholders = ", ".join("?" for _ in CSV_COLUMNS)
+    return f"INSERT INTO results (id, {', '.join(CSV_COLUMNS)}, rel_file) VALUES (?, {placeholders}, ?)"
+
+
+def common_file_root(files: Iterable[str]) -> str:
+    """Deepest directory (with trailing "/") shared by all paths, "/"-normalized"""
+    prefix: Optional[str] = None
+    for f in files:
+        f = (f or "").replace("\\", "/")
+        prefix = f if prefix is None else os.path.commonprefix([prefix, f])
+    if not prefix:
+        return ""
+    return prefix[:prefix.rfind("/") + 1]
+
+
+def relative_file(path: str, file_root: str) -> str:
+    path = path.replace("\\", "/")
+    return path[len(file_root):] if file_root and path.startswith(file_root) else path
+
+
+def _normalize_row(row: Dict[str, Any], file_root: str) -> Tuple[Any, ...]:
+    # An explicit "id" key pins the row id; otherwise SQLite assigns the next one
+    values: List[Any] = [row.get("id")]
+    for col in CSV_COLUMNS:
+        v = row.get(col)
+        if col == "line":
+            try:
+                values.append(int(v or 0))
+            except (TypeError, ValueError):
+                values.append(0)
+        else:
+            values.append("" if v is None else str(v))
+    # rel_file: path below the analyzed root, used by the file prefix filter
+    values.append(relative_file(values[CSV_COLUMNS.index("file") + 1], file_root))
+    return tuple(values)
+
+
+def build_index(rows: Iterable[Dict[str, Any]], index_path: str, file_root: Optional[str] = None) -> str:
+    """Write extraction rows into a SQLite index next to the CSV.
+
+    The file is built under a temporary name and swapped in atomically, so
+    readers never see a half-written index. file_root is the prefix stripped
+    for the relative file filter; by default the common directory of all rows.
+    """
+    if file_root is None:
+        rows = list(rows)
+        file_root = common_file_root(r.get("file") or "" for r in rows)
+
+    tmp_path = index_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        col_defs = ", ".join(
+            f"{c} INTEGER NOT NULL" if c == "line" else f"{c} TEXT NOT NULL"
+            for c in CSV_COLUMNS
+        )
+        conn.execute(f"CREATE TABLE results (id INTEGER PRIMARY KEY, {col_defs}, rel_file TEXT NOT NULL)")
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+        insert_sql = _insert_sql()
+        facet_pos = {c: CSV_COLUMNS.index(c) + 1 for c in FACET_COLUMNS}
+        facets: Dict[str, set] = {c: set() for c in FACET_COLUMNS}
+        total = 0
+        batch: List[Tuple[Any, ...]] = []
+
+        for row in rows:
+            values = _normalize_row(row, file_root)
+            for c, pos in facet_pos.items():
+                facets[c].add(values[pos])
+            batch.append(values)
+            if len(batch) >= INSERT_BATCH_SIZE:
+                conn.executemany(insert_sql, batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            conn.executemany(insert_sql, batch)
+            total += len(batch)
+
+        # Indexes are created after the bulk insert; (col, id) doubles as the
+        # keyset-pagination order for every sortable column.
+        for c in INDEXED_COLUMNS + ("rel_file",):
+            conn.execute(f"CREATE INDEX ix_results_{c} ON results ({c}, id)")
+        conn.execute("ANALYZE")
+
+        _write_meta(conn, total, facets)
+        conn.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?)",
+            [("schema_version", INDEX_SCHEMA_VERSION), ("file_root", file_root)],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, index_path)
+    return index_path
+
+
+def _write_meta(conn: sqlite3.Connection, total: int, facets: Dict[str, Iterable[str]]) -> None:
+    meta = {"total_rows": str(total)}
+    for c in FACET_COLUMNS:
+        meta[f"facet_{c}"] = json.dumps(sorted(facets[c]), ensure_ascii=False)
+    conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", meta.items())
+
+
+def update_index(index_path: str, delete_ids: Iterable[int], rows: Iterable[Dict[str, Any]]) -> None:
+    """Replace rows of an existing index in place.
+
+    Used by watch mode to refresh a live project without rebuilding the whole
+    index. The database is switched to WAL so readers are never blocked.
+    """
+    conn = sqlite3.connect(index_path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            file_root = _read_file_root(conn)
+            conn.executemany("DELETE FROM results WHERE id = ?", ((i,) for i in delete_ids))
+            conn.executemany(_insert_sql(), (_normalize_row(r, file_root) for r in rows))
+            total = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            facets = {
+                c: [v for (v,) in conn.execute(f"SELECT DISTINCT {c} FROM results")]
+                for c in FACET_COLUMNS
+            }
+            _write_meta(conn, total, facets)
+    finally:
+        conn.close()
+
+
+def build_index_from_csv(csv_path: str, index_path: Optional[str] = None) -> str:
+    index_path = index_path or index_path_for(csv_path)
+    # First pass only collects the file root, so the CSV is never held in memory
+    with open(csv_path, "r", newline="", encoding="utf-8-sig") as f:
+        file_root = common_file_root(row.get("file") or "" for row in csv.DictReader(f))
+    with open(csv_path, "r", newline="", encoding="utf-8-sig") as f:
+        return build_index(csv.DictReader(f), index_path, file_root)
+
+
+def _read_file_root(conn: sqlite3.Connection) -> str:
+    row = conn.execute("SELECT value FROM meta WHERE key = 'file_root'").fetchone()
+    return row[0] if row else ""
+
+
+def _index_is_fresh(csv_path: str, index_path: str) -> bool:
+    if not (os.path.exists(index_path)
+            and os.path.getmtime(index_path) >= os.path.getmtime(csv_path)):
+        return False
+    try:
+        conn = _connect(index_path)
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+    return bool(row) and row[0] == INDEX_SCHEMA_VERSION
+
+
+def ensure_index(csv_path: str) -> str:
+    """Return the index for csv_path, (re)building it when missing or stale."""
+    index_path = index_path_for(csv_path)
+    if _index_is_fresh(csv_path, index_path):
+        return index_path
+
+    with _build_locks_guard:
+        lock = _build_locks.setdefault(index_path, threading.Lock())
+    with lock:
+        if not _index_is_fresh(csv_path, index_path):
+            build_index_from_csv(csv_path, index_path)
+    return index_path
+
+
+def _connect(index_path: str) -> sqlite3.Connection:
+    return sqlite3.connect(f"file:{index_path}?mode=ro", uri=True, check_same_thread=False)
+
+
+def _prefix_upper_bound(prefix: str) -> str:
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _build_where(filters: Dict[str, Any], file_root: str = "") -> Tuple[List[str], List[Any]]:
+    clauses: List[str] = []
+    params: List[Any] = []
+    for col in FILTER_COLUMNS:
+        values = [v for v in (filters.get(col) or []) if v is not None]
+        if values:
+            clauses.append(f"{col} IN ({', '.join('?' for _ in values)})")
+            params.extend(values)
+
+    # file and name are matched by prefix so the (col, id) index is a range scan.
+    # file is matched below the analyzed root; absolute prefixes are accepted too.
+    file_prefix = relative_file(filters.get("file") or "", file_root)
+    for col, prefix in (("rel_file", file_prefix), ("name", filters.get("name_prefix") or "")):
+        if prefix:
+            clauses.append(f"{col} >= ? AND {col} < ?")
+            params.extend([prefix, _prefix_upper_bound(prefix)])
+    return clauses, params
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    raw = json.dumps([sort_value, row_id], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return sort_value, int(row_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def _check_sort(sort: str) -> str:
+    if sort not in SORT_COLUMNS:
+        raise ValueError(f"Unsupported sort column: {sort}")
+    return sort
+
+
+def _order_by(sort: str, descending: bool) -> str:
+    direction = "DESC" if descending else "ASC"
+    if sort == "id":
+        return f"id {direction}"
+    return f"{sort} {direction}, id {direction}"
+
+
+def query_page(
+    index_path: str,
+    filters: Dict[str, Any],
+    sort: str = "id",
+    descending: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Dict[str, Any]:
+    """Return one page of rows using keyset (cursor) pagination."""
+    sort = _check_sort(sort)
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    conn = _connect(index_path)
+    try:
+        return _query_page(conn, filters, sort, descending, cursor, limit)
+    finally:
+        conn.close()
+
+
+def _query_page(
+    conn: sqlite3.Connection,
+    filters: Dict[str, Any],
+    sort: str,
+    descending: bool,
+    cursor: Optional[str],
+    limit: int,
+) -> Dict[str, Any]:
+    clauses, params = _build_where(filters, _read_file_root(conn))
+
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        op = "<" if descending else ">"
+        if sort == "id":
+            clauses.append(f"id {op} ?")
+            params.append(row_id)
+        else:
+            clauses.append(f"({sort}, id) {op} (?, ?)")
+            params.extend([sort_value, row_id])
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = (
+        f"SELECT id, {', '.join(CSV_COLUMNS)} FROM results {where} "
+        f"ORDER BY {_order_by(sort, descending)} LIMIT ?"
+    )
+
+    fetched = conn.execute(sql, params + [limit + 1]).fetchall()
+
+    has_more = len(fetched) > limit
+    fetched = fetched[:limit]
+    rows = [dict(zip(["id"] + CSV_COLUMNS, r)) for r in fetched]
+
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        next_cursor = encode_cursor(last[sort], last["id"])
+
+    return {"rows": rows, "next_cursor": next_cursor, "has_more": has_more}
+
+
+def count_rows(index_path: str, filters: Dict[str, Any]) -> int:
+    conn = _connect(index_path)
+    try:
+        clauses, params = _build_where(filters, _read_file_root(conn))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return conn.execute(f"SELECT COUNT(*) FROM results {where}", params).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def read_meta(index_path: str) -> Dict[str, Any]:
+    conn = _connect(index_path)
+    try:
+        meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+    finally:
+        conn.close()
+    return {
+        "total_rows": int(meta.get("total_rows", 0)),
+        "facets": {c: json.loads(meta.get(f"facet_{c}", "[]")) for c in FACET_COLUMNS},
+    }
+
+
+def export_csv(index_path: str, csv_path: str) -> str:
+    """Write the whole index back to a CSV file (atomically replaced)"""
+    tmp_path = csv_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        for chunk in iter_csv_chunks(index_path, {}):
+            f.write(chunk)
+    os.replace(tmp_path, csv_path)
+    return csv_path
+
+
+def iter_csv_chunks(
+    index_path: str,
+    filters: Dict[str, Any],
+    sort: str = "id",
+    descending: bool = False,
+    chunk_rows: int = STREAM_CHUNK_ROWS,
+) -> Iterator[str]:
+    """Yield the filtered result as CSV text, chunk_rows rows at a time."""
+    sort = _check_sort(sort)
+    order_by = _order_by(sort, descending)
+
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    # BOM keeps the download compatible with the utf-8-sig CSV written by the pipeline
+    buf.write("\ufeff")
+    writer.writerow(CSV_COLUMNS)
+    yield buf.getvalue()
+
+    conn = _connect(index_path)
+    try:
+        clauses, params = _build_where(filters, _read_file_root(conn))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        cur = conn.execute(f"SELECT {', '.join(CSV_COLUMNS)} FROM results {where} ORDER BY {order_by}", params)
+        while True:
+            batch = cur.fetchmany(chunk_rows)
+            if not batch:
+                break
+            buf.seek(0)
+            buf.truncate()
+            writer.writerows(batch)
+            yield buf.getvalue()
+    finally:
+        conn.close()
@@ -0,0 +1,52 @@
+import os
+import time
+
+import pytest
+
+from result_index import read_meta
+from watch_mode import InotifySource, ProjectWatcher
+
+SOURCE = """void DemoSwc_a(void) {
+    Rte_Read_PpIn_Value(0);
+}
+int DemoSwc_b(void) { return 0; }
+"""
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_directory_rename_under_inotify_drops_old_rows(tmp_path):
+    proj = tmp_path / "proj"
+    (proj / "sub").mkdir(parents=True)
+    (proj / "sub" / "DemoSwc_a.c").write_text(SOURCE)
+    out = tmp_path / "out"
+    out.mkdir()
+
+    watcher = ProjectWatcher("p", str(proj), str(out))
+    watcher.start()
+    try:
+        if not isinstance(watcher._source, InotifySource):
+            pytest.skip("inotify is not available")
+        rows_before = read_meta(watcher.index_path)["total_rows"]
+        assert rows_before > 0
+
+        os.rename(proj / "sub", proj / "sub2")
+        new_path = str(proj / "sub2" / "DemoSwc_a.c")
+        assert _wait_for(lambda: new_path in watcher.files)
+        assert _wait_for(lambda: str(proj / "sub" / "DemoSwc_a.c") not in watcher.files)
+
+        assert read_meta(watcher.index_path)["total_rows"] == rows_before
+
+        # The renamed directory is still watched under its new path
+        with open(new_path, "a") as f:
+            f.write("void DemoSwc_c(void) {\n}\n")
+        assert _wait_for(lambda: read_meta(watcher.index_path)["total_rows"] == rows_before + 1)
+    finally:
+        watcher.stop()
@@ -0,0 +1,514 @@
+"""
+SADS/SUDS 감시(watch) 모드
+
+프로젝트 트리의 분석 상태를 메모리에 유지하고, 파일 변경 시 변경된 파일과
+그 파일을 직접/간접적으로 include 하는 소스만 다시 분석하여 CSV/인덱스를 갱신합니다.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import re
+import select
+import struct
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from pydantic import BaseModel, Field
+
+from autosar_pipeline import (
+    FunctionInfo, RteInterfaceInfo, VariableInfo, analyze_files,
+    build_result_rows, guess_swc_from_filename, load_c_files_from_directory,
+    preprocess_code,
+)
+from result_index import build_index, export_csv, index_path_for, update_index
+
+WATCHED_EXTENSIONS = (".c", ".h")
+INCLUDE_REGEX = re.compile(r'^\s*#\s*include\s*[<"]([^">]+)[">]', re.MULTILINE)
+
+DEBOUNCE_SECONDS = 0.1
+POLL_INTERVAL_SECONDS = 0.5
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+# Live row ids are (kind, file ordinal, position in file) packed into one
+# integer, so an edited file keeps its id range and id order matches the
+# function/variable/rte_interface grouping of the CSV written by /process.
+KIND_RANKS = {"function": 0, "variable": 1, "rte_interface": 2}
+ROW_ID_FILE_BITS = 20
+ROW_ID_POSITION_BITS = 20
+
+
+class WatchedFile(BaseModel):
+    path: str
+    content_hash: str = ""
+    includes: List[str] = Field(default_factory=list)
+    functions: List[FunctionInfo] = Field(default_factory=list)
+    variables: List[VariableInfo] = Field(default_factory=list)
+    rte_interfaces: List[RteInterfaceInfo] = Field(default_factory=list)
+    issues: List[str] = Field(default_factory=list)
+    row_ids: List[int] = Field(default_factory=list)
+
+
+class WatchedHeader(BaseModel):
+    path: str
+    content_hash: str = ""
+    includes: List[str] = Field(default_factory=list)
+
+
+def _content_hash(code: str) -> str:
+    return hashlib.sha1(code.encode("utf-8", errors="ignore")).hexdigest()
+
+
+def _is_watched(path: str) -> bool:
+    return path.endswith(WATCHED_EXTENSIONS)
+
+
+def _read_source(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _parse_includes(code: str) -> List[str]:
+    return [os.path.basename(i) for i in INCLUDE_REGEX.findall(code)]
+
+
+class InotifySource:
+    """Change notifications from Linux inotify (via libc, no extra package)"""
+
+    def __init__(self, root: str):
+        libc_name = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self._fd = self._libc.inotify_init1(os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: Dict[int, str] = {}
+        self._add_tree(root)
+
+    def _add_watch(self, directory: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd >= 0:
+            self._watches[wd] = directory
+
+    def _remove_tree(self, root: str) -> None:
+        prefix = root + os.sep
+        for wd, directory in list(self._watches.items()):
+            if directory == root or directory.startswith(prefix):
+                # Fails harmlessly when the kernel already dropped the watch (deleted dir)
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+
+    def _add_tree(self, root: str) -> Set[str]:
+        found: Set[str] = set()
+        for dirpath, dirs, files in os.walk(root):
+            self._add_watch(dirpath)
+            found.update(os.path.join(dirpath, f) for f in files)
+        return found
+
+    def read_changes(self, timeout: float) -> Optional[Set[str]]:
+        """Return changed paths, or None when events were lost (full rescan needed)"""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        data = os.read(self._fd, 64 * 1024)
+        changed: Set[str] = set()
+        rescan = False
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", errors="ignore")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                return None
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                # New or moved-in directories need their own watches
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    changed.update(self._add_tree(path))
+                # Files under a removed or moved-away directory get no events of
+                # their own; drop its watches and let the caller rescan by hash
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    self._remove_tree(path)
+                    rescan = True
+                continue
+            changed.add(path)
+        return None if rescan else changed
+
+    def has_pending(self) -> bool:
+        ready, _, _ = select.select([self._fd], [], [], 0)
+        return bool(ready)
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class PollingSource:
+    """Fallback change detection by periodically comparing mtime/size"""
+
+    def __init__(self, root: str, interval: float = POLL_INTERVAL_SECONDS):
+        self._root = root
+        self._interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, tuple]:
+        snapshot: Dict[str, tuple] = {}
+        for dirpath, dirs, files in os.walk(self._root):
+            for f in files:
+                if _is_watched(f):
+                    path = os.path.join(dirpath, f)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def read_changes(self, timeout: float) -> Optional[Set[str]]:
+        time.sleep(min(timeout, self._interval))
+        current = self._scan()
+        changed = {p for p in current.keys() | self._snapshot.keys()
+                   if current.get(p) != self._snapshot.get(p)}
+        self._snapshot = current
+        return changed
+
+    def has_pending(self) -> bool:
+        return False
+
+    def close(self) -> None:
+        pass
+
+
+def create_change_source(root: str, use_inotify: bool = True):
+    if use_inotify:
+        try:
+            return InotifySource(root)
+        except (OSError, AttributeError, TypeError):
+            pass
+    return PollingSource(root)
+
+
+class ProjectWatcher:
+    """Keeps a warm analysis state of a project tree and refreshes it on change.
+
+    Output CSV and index use fixed names (live_<name>.csv / .sqlite) so the
+    result viewer always shows the latest state of the live project.
+    """
+
+    def __init__(self, name: str, directory_path: str, output_folder: str,
+                 build_config: Optional[Dict[str, Any]] = None, use_inotify: bool = True):
+        self.name = name
+        self.directory_path = os.path.abspath(directory_path)
+        self.build_config = dict(build_config or {})
+        self.csv_filename = f"live_{name}.csv"
+        self.csv_path = os.path.join(output_folder, self.csv_filename)
+        self.index_path = index_path_for(self.csv_path)
+        self.use_inotify = use_inotify
+
+        self.files: Dict[str, WatchedFile] = {}
+        self.headers: Dict[str, WatchedHeader] = {}
+        self.translation_units: Dict[str, Any] = {}
+        self.backend = ""
+        self.last_update: Optional[str] = None
+        self.last_update_seconds = 0.0
+        self.last_changed_files: List[str] = []
+        self.update_count = 0
+        self.error = ""
+
+        self._file_ordinals: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._source = None
+        # The full CSV export runs on its own thread so a slow export never
+        # delays index updates; _csv_dirty marks an export still owed
+        self._csv_dirty = False
+        self._export_requested = threading.Event()
+        self._export_thread: Optional[threading.Thread] = None
+
+    def _analyze(self, path: str, code: str) -> WatchedFile:
+        issues: List[str] = []
+        pre = {path: preprocess_code(code)}
+        funcs, vars_, rtes = analyze_files(pre, self.build_config, issues, self.translation_units)
+        return WatchedFile(
+            path=path,
+            content_hash=_content_hash(code),
+            includes=_parse_includes(code),
+            functions=funcs,
+            variables=vars_,
+            rte_interfaces=rtes,
+            issues=issues,
+        )
+
+    def _assign_rows(self, entry: WatchedFile) -> List[Dict[str, Any]]:
+        rows = build_result_rows(entry.functions, entry.variables, entry.rte_interfaces)
+        # Files keep their ordinal for the lifetime of the watcher; new files go last
+        ordinal = self._file_ordinals.setdefault(entry.path, len(self._file_ordinals) + 1)
+        positions: Dict[str, int] = {}
+        entry.row_ids = []
+        for row in rows:
+            position = positions.get(row["kind"], 0)
+            positions[row["kind"]] = position + 1
+            row["id"] = (
+                (KIND_RANKS[row["kind"]] << (ROW_ID_FILE_BITS + ROW_ID_POSITION_BITS))
+                | (ordinal << ROW_ID_POSITION_BITS)
+                | position
+            )
+            entry.row_ids.append(row["id"])
+        return rows
+
+    def _dependents_of(self, header_names: Set[str]) -> Set[str]:
+        """Sources including any of header_names, directly or through other headers"""
+        seen = set(header_names)
+        pending = list(header_names)
+        sources: Set[str] = set()
+        while pending:
+            name = pending.pop()
+            for header in self.headers.values():
+                base = os.path.basename(header.path)
+                if name in header.includes and base not in seen:
+                    seen.add(base)
+                    pending.append(base)
+            sources.update(p for p, entry in self.files.items() if name in entry.includes)
+        return sources
+
+    def _refresh_header(self, path: str) -> bool:
+        """Update the include graph entry of a header; True if it really changed"""
+        code = _read_source(path) if os.path.isfile(path) else None
+        if code is None:
+            return self.headers.pop(path, None) is not None
+        content_hash = _content_hash(code)
+        old = self.headers.get(path)
+        if old and old.content_hash == content_hash:
+            return False
+        self.headers[path] = WatchedHeader(path=path, content_hash=content_hash, includes=_parse_includes(code))
+        return True
+
+    def start(self) -> None:
+        """Analyze the whole tree once, then watch it in a background thread"""
+        started = time.time()
+        # Watch before the initial scan so edits made during it are not lost
+        self._source = create_change_source(self.directory_path, self.use_inotify)
+        self.backend = "inotify" if isinstance(self._source, InotifySource) else "polling"
+
+        rows: List[Dict[str, Any]] = []
+        try:
+            with self._lock:
+                for path, code in sorted(load_c_files_from_directory(self.directory_path).items()):
+                    entry = self._analyze(path, code)
+                    self.files[path] = entry
+                    rows.extend(self._assign_rows(entry))
+                for path in self._walk_paths((".h",)):
+                    self._refresh_header(path)
+                # Explicit root: files added later anywhere in the tree stay relative to it
+                root = self.directory_path.replace("\\", "/").rstrip("/") + "/"
+                build_index(rows, self.index_path, root)
+                export_csv(self.index_path, self.csv_path)
+                self._mark_updated(started, [])
+        except Exception:
+            self._source.close()
+            raise
+
+        self._export_thread = threading.Thread(target=self._export_loop, name=f"export-{self.name}", daemon=True)
+        self._export_thread.start()
+        self._thread = threading.Thread(target=self._run, name=f"watch-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching; returns once the watcher thread has fully exited"""
+        self._stop.set()
+        # The source is closed only after the thread is gone, otherwise it could
+        # select() on a closed (or reused) inotify fd
+        if self._thread:
+            self._thread.join()
+        if self._source:
+            self._source.close()
+        self._export_requested.set()
+        if self._export_thread:
+            self._export_thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            changed = self._source.read_changes(POLL_INTERVAL_SECONDS)
+            if changed is None:
+                changed = self._all_known_paths()
+            if not changed:
+                self._flush_csv()
+                continue
+            # Editors write a file in several steps; collect the burst first
+            while True:
+                more = self._source.read_changes(DEBOUNCE_SECONDS)
+                if more is None:
+                    more = self._all_known_paths()
+                if not more:
+                    break
+                changed |= more
+            try:
+                self.apply_changes(changed)
+                self.error = ""
+            except Exception as e:
+                self.error = str(e)
+
+    def _flush_csv(self) -> None:
+        """Hand an owed CSV export to the export thread once no events are pending"""
+        if self._csv_dirty and not (self._source and self._source.has_pending()):
+            self._csv_dirty = False
+            self._export_requested.set()
+
+    def _export_loop(self) -> None:
+        while True:
+            self._export_requested.wait()
+            if self._stop.is_set():
+                return
+            self._export_requested.clear()
+            try:
+                export_csv(self.index_path, self.csv_path)
+            except Exception as e:
+                self.error = f"CSV export failed: {e}"
+                self._csv_dirty = True
+
+    def _walk_paths(self, extensions: tuple) -> Set[str]:
+        return {
+            os.path.join(dirpath, f)
+            for dirpath, dirs, files in os.walk(self.directory_path)
+            for f in files if f.endswith(extensions)
+        }
+
+    def _all_known_paths(self) -> Set[str]:
+        # After an inotify overflow every file is a candidate; content hashes of
+        # sources and headers decide what actually changed
+        return self._walk_paths(WATCHED_EXTENSIONS) | set(self.files) | set(self.headers)
+
+    def apply_changes(self, changed_paths: Set[str]) -> List[str]:
+        """Re-analyze changed sources and sources including changed headers.
+
+        Returns the list of source files whose rows were replaced.
+        """
+        started = time.time()
+        with self._lock:
+            changed_headers = {
+                os.path.basename(p) for p in changed_paths
+                if p.endswith(".h") and self._refresh_header(p)
+            }
+            targets: Dict[str, bool] = {p: False for p in changed_paths if p.endswith(".c")}
+            for dep in self._dependents_of(changed_headers):
+                targets[dep] = True
+
+            delete_ids: List[int] = []
+            rows: List[Dict[str, Any]] = []
+            touched: List[str] = []
+            for path, force in sorted(targets.items()):
+                old = self.files.get(path)
+                if not os.path.isfile(path):
+                    if old:
+                        delete_ids.extend(old.row_ids)
+                        del self.files[path]
+                        self.translation_units.pop(path, None)
+                        touched.append(path)
+                    continue
+                code = _read_source(path)
+                if code is None:
+                    continue
+                if old and not force and old.content_hash == _content_hash(code):
+                    continue
+                entry = self._analyze(path, code)
+                if old:
+                    delete_ids.extend(old.row_ids)
+                rows.extend(self._assign_rows(entry))
+                self.files[path] = entry
+                touched.append(path)
+
+            if touched:
+                update_index(self.index_path, delete_ids, rows)
+                self._csv_dirty = True
+                self._mark_updated(started, touched)
+
+        # The index is already current; the full CSV follows once the burst of
+        # changes is over (also when this burst touched no source at all)
+        self._flush_csv()
+        return touched
+
+    def _mark_updated(self, started: float, touched: List[str]) -> None:
+        self.last_update = time.strftime("%Y-%m-%d %H:%M:%S")
+        self.last_update_seconds = round(time.time() - started, 3)
+        self.last_changed_files = touched
+        self.update_count += 1
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = list(self.files.values())
+            issues: List[str] = []
+            for entry in entries:
+                for issue in entry.issues:
+                    if issue not in issues:
+                        issues.append(issue)
+            swcs = sorted({s for s in (guess_swc_from_filename(e.path) for e in entries) if s})
+            return {
+                'name': self.name,
+                'directory_path': self.directory_path,
+                'backend': self.backend,
+                'running': bool(self._thread and self._thread.is_alive()),
+                'csv_filename': self.csv_filename,
+                'download_url': f'/download/{self.csv_filename}',
+                'results_url': f'/api/results/{self.csv_filename}',
+                'total_files': len(entries),
+                'total_functions': sum(len(e.functions) for e in entries),
+                'total_variables': sum(len(e.variables) for e in entries),
+                'total_rte_interfaces': sum(len(e.rte_interfaces) for e in entries),
+                'swc_candidates': swcs,
+                'issues': issues,
+                'update_count': self.update_count,
+                'last_update': self.last_update,
+                'last_update_seconds': self.last_update_seconds,
+                'last_changed_files': self.last_changed_files,
+                'error': self.error,
+            }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="SADS/SUDS watch mode")
+    parser.add_argument("directory_path")
+    parser.add_argument("--name", default="project")
+    parser.add_argument("--output", default="outputs")
+    parser.add_argument("--poll", action="store_true", help="use polling instead of inotify")
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    watcher = ProjectWatcher(args.name, args.directory_path, args.output, use_inotify=not args.poll)
+    watcher.start()
+    print(f"감시 중 ({watcher.backend}): {watcher.directory_path} -> {watcher.csv_path}")
+    try:
+        last = watcher.update_count
+        while True:
+            time.sleep(0.5)
+            if watcher.update_count != last:
+                last = watcher.update_count
+                s = watcher.status()
+                print(f"[{s['last_update']}] {len(s['last_changed_files'])}개 파일 갱신 ({s['last_update_seconds']}s)")
+    except KeyboardInterrupt:
+        watcher.stop()